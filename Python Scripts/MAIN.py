@@ -1,122 +1,94 @@
 import sys
 import os
-import pandas as pd
 import numpy as np
 import tkinter as tk
 from tkinter import ttk, filedialog, scrolledtext
 import serial
 import threading
 import time
-import csv
+from collections import deque
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import matplotlib.animation as animation
+from analysis_core import (RECORD, SENSOR_IDS, read_data, calculate_plateau_coefficient,
+                           find_peak_grip_strength, find_time_for_percentages)
+from acquisition_core import LogWriter, SensorBuffer, downsample, plot_xlim, sample_time
 
 # ----- Serial Setup -----
 SERIAL_PORT = "COM3"  # Update as needed
 BAUD_RATE = 9600
-ser = serial.Serial(SERIAL_PORT, BAUD_RATE, timeout=1)
+ser = serial.Serial(SERIAL_PORT, BAUD_RATE, timeout=None)  # Reads block until data arrives
 time.sleep(2)  # Allow Arduino to initialize
 ser.reset_input_buffer()  # Clear any junk data
 
 print("Waiting for Arduino to be ready...")
 while True:
-    if ser.in_waiting > 0:
-        line = ser.readline().decode('utf-8', errors="ignore").strip()
-        if "READY" in line:
-            print("Arduino is ready!")
-            break
+    line = ser.read_until(b"\n").decode('utf-8', errors="ignore").strip()
+    if "READY" in line:
+        print("Arduino is ready!")
+        break
 
 # ----- Data Storage for Plotting -----
 sensor_data = {
-    "FSR": [],
-    "Weight": []
+    "FSR": SensorBuffer(),
+    "Weight": SensorBuffer()
 }
 
 start_time = None
 
 # ----- Serial Reading Thread -----
+reader_stop = threading.Event()  # Set at shutdown to end the reading loop
+
 def serial_reader():
     global start_time
-    while True:
+    buf = b""
+    while not reader_stop.is_set():
+        # Block in the driver until a full line arrives, then take whatever else
+        # is already waiting so a burst is handled in one pass. Any partial
+        # line is kept for the next iteration.
+        buf += ser.read_until(b"\n")
         if ser.in_waiting > 0:
-            line = ser.readline().decode('utf-8', errors="ignore").strip()
-            if "," in line:
-                try:
-                    value_str, sensor_type = line.split(",")
-                    value = float(value_str)
-                    now = time.time()
-                    
-                    if start_time is None:
-                        start_time = now
-
-                    ts_str = time.strftime("%Y-%m-%d %H:%M:%S")
-                    with open(app.csv_filename, mode="a", newline="") as f:
-                        writer = csv.writer(f)
-                        writer.writerow([ts_str, value, sensor_type])
-
-                    if sensor_type in sensor_data:
-                        sensor_data[sensor_type].append((now - start_time, value))
-
-                except ValueError:
-                    print("Invalid data received:", line)
-        time.sleep(0.1)
+            buf += ser.read(ser.in_waiting)
+        lines = buf.split(b"\n")
+        buf = lines.pop()
+        for raw in lines:
+            line = raw.decode('utf-8', errors="ignore").strip()
+            if "," not in line:
+                continue
+            try:
+                value_str, sensor_type = line.split(",")
+                value = float(value_str)
+                now = sample_time()
+                
+                if start_time is None:
+                    start_time = now
+
+                if sensor_type in SENSOR_IDS:
+                    app.log_writer.write(RECORD.pack(now, value, SENSOR_IDS[sensor_type]))
+
+                if sensor_type in sensor_data:
+                    sensor_data[sensor_type].append(now - start_time, value)
+
+            except ValueError:
+                print("Invalid data received:", line)
 
 serial_thread = threading.Thread(target=serial_reader, daemon=True)
 serial_thread.start()
 
 # ----- Analysis Functions -----
-def read_data(file_path: str):
+def warm_up_analysis():
     """
-    Read the grip strength data from a CSV file.
-    Expected columns: 'Timestamp', 'Value', 'Sensor'.
+    Run the analysis once on dummy data so numba compiles (or loads from its
+    cache) the kernels before the user first presses "Analysis".
     """
-    data = pd.read_csv(file_path, parse_dates=['Timestamp'])
-    # Filter data for only weight sensor values
-    data = data[data['Sensor'] == 'Weight']
-    # Reset index for convenience
-    data.reset_index(drop=True, inplace=True)
-    # Convert Timestamp to elapsed time in seconds
-    data['Time'] = (data['Timestamp'] - data['Timestamp'].iloc[0]).dt.total_seconds()
-    data.rename(columns={'Value': 'Grip_Strength'}, inplace=True)
-    return data[['Time', 'Grip_Strength']]
-
-def calculate_plateau_coefficient(data):
-    max_hgs = data['Grip_Strength'].max()
-    threshold = 0.9 * max_hgs
-    plateau_region = data[data['Grip_Strength'] >= threshold]
-
-    if plateau_region.empty:
-        return None  # No plateau region found
-
-    plateau_mean = plateau_region['Grip_Strength'].mean()
-    plateau_std = plateau_region['Grip_Strength'].std()
-
-    coefficient_of_variation = (plateau_std * 100) / plateau_mean
-    return coefficient_of_variation
-
-def find_peak_grip_strength(data):
-    peak_hgs = data['Grip_Strength'].max()
-    peak_time = data.loc[data['Grip_Strength'].idxmax(), 'Time']
-    return peak_hgs, peak_time
-
-def find_time_for_percentages(data, percentages):
-    results = {}
-    max_hgs, peak_time = find_peak_grip_strength(data)
-
-    # Consider only the data points after the peak is reached
-    post_peak_data = data[data['Time'] >= peak_time]
+    elapsed = np.arange(4, dtype=np.float64)
+    grip_strength = np.array([1.0, 3.0, 2.0, 1.0])
+    calculate_plateau_coefficient(grip_strength)
+    find_time_for_percentages(elapsed, grip_strength, [80, 75, 50, 25])
 
-    for percentage in percentages:
-        target = max_hgs * (percentage / 100)
-        subset = post_peak_data[post_peak_data['Grip_Strength'] <= target]
-
-        if not subset.empty:
-            results[percentage] = subset.iloc[0]['Time'] - peak_time
-        else:
-            results[percentage] = None
-
-    return results
+# Compile in the background so the JIT cost never lands on a button click
+warmup_thread = threading.Thread(target=warm_up_analysis, daemon=True)
+warmup_thread.start()
 
 # ----- GUI Application -----
 class App(tk.Tk):
@@ -125,18 +97,17 @@ class App(tk.Tk):
         self.title("Arduino Control & Data Logging")
         self.geometry("900x700")
         
-        self.csv_filename = None
+        self.log_filename = None
+        self.log_writer = None
         self.prompt_for_filename()
-        if not self.csv_filename:
+        if not self.log_filename:
             print("No file selected. Exiting.")
             ser.close()
             self.destroy()
             return
 
-        # CSV Setup
-        with open(self.csv_filename, mode="w", newline="") as f:
-            writer = csv.writer(f)
-            writer.writerow(["Timestamp", "Value", "Sensor"])
+        # Sensor log setup: keep the file open for the whole session
+        self.log_writer = LogWriter(self.log_filename)
         
         # Control Frame: Buttons for mode selection
         control_frame = ttk.Frame(self)
@@ -161,16 +132,21 @@ class App(tk.Tk):
         
         self.ax_fsr.set_title("FSR Force-Time")
         self.ax_fsr.set_ylabel("FSR Reading")
-        
-        self.ax_weight.set_title("Weight-Time")
-        self.ax_weight.set_ylabel("Weight (units?)")
+        self.ax_fsr.set_xlabel("Time (s)")
+
+        self.ax_weight.set_title("Load Cell Weight-Time")
+        self.ax_weight.set_ylabel("Weight")
         self.ax_weight.set_xlabel("Time (s)")
 
+        # The line artists are created once; update_plot only swaps their data
+        self.line_fsr, = self.ax_fsr.plot([], [], marker=".", linestyle="-", markersize=3, linewidth=1)
+        self.line_weight, = self.ax_weight.plot([], [], marker=".", linestyle="-", markersize=3, linewidth=1)
+
         self.canvas = FigureCanvasTkAgg(self.fig, master=self)
         self.canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
         
         # Start animation to update plot every 1 second
-        self.ani = animation.FuncAnimation(self.fig, self.update_plot, interval=1000)
+        self.ani = animation.FuncAnimation(self.fig, self.update_plot, interval=1000, blit=True)
 
         # Analysis Output Frame
         analysis_frame = ttk.LabelFrame(self, text="Analysis Output")
@@ -183,10 +159,10 @@ class App(tk.Tk):
         sys.stdout = TextRedirector(self.analysis_output)
 
     def prompt_for_filename(self):
-        self.csv_filename = filedialog.asksaveasfilename(
-            defaultextension=".csv",
-            filetypes=[("CSV files", "*.csv")],
-            title="Save CSV File As"
+        self.log_filename = filedialog.asksaveasfilename(
+            defaultextension=".bin",
+            filetypes=[("Sensor log files", "*.bin")],
+            title="Save Sensor Log As"
         )
 
     def send_command(self, cmd):
@@ -201,11 +177,14 @@ class App(tk.Tk):
 
     def run_analysis(self):
         try:
-            data = read_data(self.csv_filename)
-            peak_hgs, peak_time = find_peak_grip_strength(data)
-            plateau_coefficient = calculate_plateau_coefficient(data)
+            # Make sure queued samples are on disk
+            if not self.log_writer.flush():
+                print("Warning: the sensor log may be missing recent samples.")
+            elapsed, grip_strength = read_data(self.log_filename, 'Weight')
+            peak_hgs, peak_time = find_peak_grip_strength(elapsed, grip_strength)
+            plateau_coefficient = calculate_plateau_coefficient(grip_strength)
             percentages = [80, 75, 50, 25]
-            time_to_percentages = find_time_for_percentages(data, percentages)
+            time_to_percentages = find_time_for_percentages(elapsed, grip_strength, percentages)
 
             print("\nAnalysis Results:")
             print(f"Peak Grip Strength: {peak_hgs:.2f} units at {peak_time:.2f} seconds")
@@ -223,39 +202,63 @@ class App(tk.Tk):
             print(f"Error running analysis: {e}")
 
     def update_plot(self, frame):
-        # Clear each subplot
-        self.ax_fsr.clear()
-        self.ax_weight.clear()
-
-        # Redraw titles, labels
-        self.ax_fsr.set_title("FSR Force-Time")
-        self.ax_fsr.set_ylabel("FSR Reading")
-        self.ax_fsr.set_xlabel("Time (s)")
-
-        self.ax_weight.set_title("Load Cell Weight-Time")
-        self.ax_weight.set_ylabel("Weight")
-        self.ax_weight.set_xlabel("Time (s)")
-
-        # Plot FSR data if available
-        if sensor_data["FSR"]:
-            times, forces = zip(*sensor_data["FSR"])
-            self.ax_fsr.plot(times, forces, marker=".", linestyle="-", markersize=3, linewidth=1)
-
-        # Plot Weight data if available
-        if sensor_data["Weight"]:
-            times, weights = zip(*sensor_data["Weight"])
-            self.ax_weight.plot(times, weights, marker=".", linestyle="-", markersize=3, linewidth=1)
-
-        self.canvas.draw()
+        old_limits = (self.ax_fsr.get_xlim(), self.ax_fsr.get_ylim(), self.ax_weight.get_ylim())
+        for name, line, ax in (("FSR", self.line_fsr, self.ax_fsr),
+                               ("Weight", self.line_weight, self.ax_weight)):
+            samples = sensor_data[name].read()
+            if samples is None:
+                continue  # Nothing new for this sensor since the last frame
+            times, values = downsample(*samples)
+            line.set_data(times, values)
+            # Only autoscale the values; the shared time axis is set below
+            ax.relim()
+            ax.autoscale_view(scalex=False)
+
+        # The axes share one time axis, so size it from both lines, including a
+        # sensor that sent nothing this frame, and grow it in coarse steps
+        plotted = [line.get_xdata() for line in (self.line_fsr, self.line_weight)]
+        plotted = [times for times in plotted if len(times)]
+        if plotted:
+            first = min(times[0] for times in plotted)
+            last = max(times[-1] for times in plotted)
+            self.ax_fsr.set_xlim(plot_xlim(old_limits[0], first, last))
+        limits_changed = (self.ax_fsr.get_xlim(), self.ax_fsr.get_ylim(),
+                          self.ax_weight.get_ylim()) != old_limits
+
+        # Blitting only repaints the lines, so redraw the full figure (ticks and
+        # labels) when the axis limits have moved. The animation then re-caches
+        # the new background before blitting the lines on top.
+        if limits_changed:
+            self.canvas.draw()
+
+        return self.line_fsr, self.line_weight
 
 # Redirector Class for Text Widget
+LOG_FLUSH_MS = 100  # How often queued output is moved into the text widget
+
 class TextRedirector:
+    """
+    Queue written text and let the Tk event loop insert it into the widget in
+    one batch every LOG_FLUSH_MS, so a burst of prints costs a single re-layout.
+    Writes only touch the deque, which also makes printing from the serial
+    thread safe.
+    """
     def __init__(self, widget):
         self.widget = widget
+        self.pending = deque()
+        self.widget.after(LOG_FLUSH_MS, self._flush_log)
 
     def write(self, text):
-        self.widget.insert(tk.END, text)
-        self.widget.see(tk.END)  # Auto-scroll to the bottom
+        self.pending.append(text)
+
+    def _flush_log(self):
+        if self.pending:
+            chunks = []
+            while self.pending:
+                chunks.append(self.pending.popleft())
+            self.widget.insert(tk.END, "".join(chunks))
+            self.widget.see(tk.END)  # Auto-scroll to the bottom
+        self.widget.after(LOG_FLUSH_MS, self._flush_log)
 
     def flush(self):
         pass
@@ -264,5 +267,11 @@ class TextRedirector:
 app = App()
 app.mainloop()
 
-# Close the serial port when the GUI closes
-ser.close()
\ No newline at end of file
+# Stop the serial reader before closing the sensor log, so no record is
+# queued behind the writer's sentinel, then close the port and the log
+reader_stop.set()
+ser.cancel_read()  # Wake the reader from its blocking read
+serial_thread.join(timeout=1.0)
+ser.close()
+if app.log_writer is not None:
+    app.log_writer.close()
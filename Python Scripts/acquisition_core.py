@@ -0,0 +1,166 @@
+import threading
+import queue
+import time
+import numpy as np
+
+FLUSH_INTERVAL = 1.0  # Seconds between flushes of the sensor log to disk
+FLUSH_TIMEOUT = 5.0  # Longest wait for the log writer to catch up
+
+# ----- Sample Clock -----
+# Anchor the wall clock once and advance it with the monotonic clock, so
+# sample timestamps read as seconds since the epoch but never step backwards
+# when the system clock is adjusted.
+CLOCK_EPOCH = time.time()
+CLOCK_START = time.monotonic()
+
+def sample_time():
+    return CLOCK_EPOCH + (time.monotonic() - CLOCK_START)
+
+# ----- Sensor Log Writer Thread -----
+class LogWriter:
+    """
+    Append packed records to the sensor log from a dedicated thread, so a slow
+    disk never delays the next serial read. The reader only enqueues bytes;
+    the writer drains everything queued and writes it as one block.
+    """
+    def __init__(self, filename):
+        self.file = open(filename, mode="wb", buffering=1 << 16)
+        self.queue = queue.Queue()
+        self.error = None  # Last write error, if any; the log is incomplete after one
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def write(self, record):
+        self.queue.put(record)
+
+    def flush(self, timeout=FLUSH_TIMEOUT):
+        """
+        Wait until every record queued before this call has been written and
+        flushed to disk. Returns False if the writer is gone, did not catch up
+        within `timeout` seconds, or has failed to write part of the log.
+        """
+        if not self.thread.is_alive():
+            return False
+        done = threading.Event()
+        self.queue.put(done)  # Marker: set by the writer once it reaches this point
+        return done.wait(timeout) and self.error is None
+
+    def close(self, timeout=FLUSH_TIMEOUT):
+        self.queue.put(None)  # Sentinel: write what is left, then close the file
+        self.thread.join(timeout)
+
+    def _run(self):
+        last_flush = time.time()
+        while True:
+            try:
+                items = [self.queue.get(timeout=FLUSH_INTERVAL)]
+            except queue.Empty:
+                self._try(self.file.flush)  # Idle, so push out whatever is still buffered
+                last_flush = time.time()
+                continue
+            # Drain only what was already queued, so a steady stream of samples
+            # cannot hold back a flush marker, and stop at the sentinel; anything
+            # queued after it arrived too late and is dropped with the thread
+            for _ in range(self.queue.qsize()):
+                if items[-1] is None:
+                    break
+                try:
+                    items.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            closing = items[-1] is None
+            markers = [item for item in items if isinstance(item, threading.Event)]
+            self._try(self.file.write, b"".join(item for item in items if isinstance(item, bytes)))
+            if closing:
+                self._try(self.file.close)
+            elif markers or time.time() - last_flush >= FLUSH_INTERVAL:
+                self._try(self.file.flush)
+                last_flush = time.time()
+
+            for marker in markers:
+                marker.set()
+            if closing:
+                return
+
+    def _try(self, operation, *args):
+        """Run one file operation, reporting a failure instead of ending the thread."""
+        try:
+            operation(*args)
+        except OSError as e:
+            self.error = e
+            print(f"Error writing sensor log: {e}")
+
+# ----- Data Storage for Plotting -----
+PLOT_CAPACITY = 50000  # Most recent samples kept per sensor for plotting
+PLOT_HEADROOM = 1024  # Slots outside the returned window the reader can fill meanwhile
+
+class SensorBuffer:
+    """
+    Single-producer/single-consumer ring buffer of (time, value) samples for
+    one sensor. Only the serial thread writes `head` and only the GUI writes
+    `tail`; each side just reads the other's index, so no lock is needed.
+    Times and values live in separate float arrays, and every sample is
+    written twice (at i and i + size) so the latest samples are always
+    available as one contiguous slice, returned as a view. The ring holds
+    `headroom` more slots than the window it returns, so the serial thread
+    can keep appending while the GUI copies that view (in downsample and
+    Line2D.set_data) without overwriting any sample in it.
+    """
+    def __init__(self, capacity=PLOT_CAPACITY, headroom=PLOT_HEADROOM):
+        self.capacity = capacity
+        self.size = capacity + headroom
+        self.times = np.empty(2 * self.size, dtype=np.float64)
+        self.values = np.empty(2 * self.size, dtype=np.float64)
+        self.head = 0  # Producer: total number of samples ever written
+        self.tail = 0  # Consumer: value of head at the last read
+
+    def append(self, t, value):
+        i = self.head % self.size
+        self.times[i] = self.times[i + self.size] = t
+        self.values[i] = self.values[i + self.size] = value
+        self.head += 1  # Publish only after the sample is fully written
+
+    def read(self):
+        """
+        Return (times, values) views of the latest samples, oldest first, or
+        None if nothing has been published since the previous read.
+        """
+        head = self.head  # Read the producer's index exactly once
+        if head == self.tail:
+            return None
+        self.tail = head
+
+        end = head % self.size
+        if head >= self.size:
+            end += self.size
+        start = end - min(head, self.capacity)
+        return self.times[start:end], self.values[start:end]
+
+PLOT_MAX_POINTS = 2000  # Most points handed to Matplotlib per line and frame
+
+def downsample(times, values, target=PLOT_MAX_POINTS):
+    """
+    Thin the samples with a fixed stride so at most `target` points are drawn,
+    always keeping the newest sample. Short series are returned untouched.
+    """
+    n = len(times)
+    if n <= target:
+        return times, values
+    step = -(-n // target)  # Ceiling division
+    start = (n - 1) % step
+    return times[start::step], values[start::step]
+
+PLOT_MIN_SPAN = 10.0  # Seconds shown on the time axis before it first grows
+
+def plot_xlim(xlim, first, last):
+    """
+    Return time-axis limits for samples spanning `first` to `last`. The current
+    limits are kept while the samples fit; once they run past an edge, the axis
+    jumps to twice the span of the retained samples, so it changes only now and
+    then instead of on every frame.
+    """
+    left, right = xlim
+    if left <= first and last <= right:
+        return xlim
+    return first, first + max(PLOT_MIN_SPAN, 2 * (last - first))
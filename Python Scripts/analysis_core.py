@@ -0,0 +1,189 @@
+import os
+import struct
+from functools import lru_cache
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the kernels below then run as plain Python
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
+
+# ----- Sensor Log Format -----
+# Each sample is one fixed-width little-endian record: float64 timestamp
+# (seconds since the epoch, from a monotonic clock so it never decreases),
+# float32 value and uint8 sensor id (13 bytes).
+RECORD = struct.Struct('<dfB')
+RECORD_DTYPE = np.dtype([('Timestamp', '<f8'), ('Value', '<f4'), ('Sensor', 'u1')])
+SENSOR_IDS = {"FSR": 0, "Weight": 1}
+
+@lru_cache(maxsize=4)
+def _load_sensors(file_path: str, mtime_ns: int, size: int):
+    """
+    Read every sensor's data from a binary sensor log in a single read.
+    Returns a dict mapping each sensor type to (time, values) float64 arrays,
+    which are views into one buffer grouped by sensor. The modification time
+    and size are only part of the cache key, so a log that has grown since
+    the last call is read again.
+    """
+    # Ignore a trailing partial record in case the logger is mid-write
+    count = size // RECORD_DTYPE.itemsize
+    records = np.fromfile(file_path, dtype=RECORD_DTYPE, count=count)
+    # A stable sort groups the records by sensor while keeping each group in time order
+    order = np.argsort(records['Sensor'], kind='stable')
+    codes = records['Sensor'][order]
+    timestamps = records['Timestamp'][order]
+    values = records['Value'][order].astype(np.float64)
+
+    sensors = {}
+    for sensor_type, code in SENSOR_IDS.items():
+        start, end = np.searchsorted(codes, [code, code + 1])
+        if start == end:
+            continue  # No readings for this sensor
+        time = timestamps[start:end]
+        # Timestamp is logged as float seconds, so elapsed time is a plain subtraction
+        time -= time[0]
+        sensors[sensor_type] = (time, values[start:end])
+    return sensors
+
+def read_data(file_path: str, sensor_type: str):
+    """
+    Read one sensor's data from a binary sensor log (see RECORD_DTYPE).
+    Returns (time, values) as float64 NumPy arrays, with time in seconds
+    since the first sample of that sensor. Parses are cached per file
+    version, so the arrays are shared between calls and must not be modified.
+    """
+    if sensor_type not in SENSOR_IDS:
+        raise ValueError(f"Unsupported sensor type: {sensor_type}")
+
+    stat = os.stat(file_path)
+    sensors = _load_sensors(file_path, stat.st_mtime_ns, stat.st_size)
+    if sensor_type not in sensors:
+        raise ValueError(f"No {sensor_type} readings found in the file")
+    return sensors[sensor_type]
+
+# ----- Grip Strength Analysis -----
+@njit(cache=True, fastmath=True)
+def _plateau_kernel(grip_strength):
+    """
+    Two passes over the raw readings: the first finds the peak, the second keeps
+    a running (Welford) mean and sum of squares of the samples within 90% of it.
+    """
+    if len(grip_strength) == 0:
+        return np.nan, 0, 0.0, 0.0
+
+    max_hgs = grip_strength[0]
+    for x in grip_strength:
+        if x > max_hgs:
+            max_hgs = x
+
+    threshold = 0.9 * max_hgs
+    count = 0
+    mean = 0.0
+    m2 = 0.0
+    for x in grip_strength:
+        if x >= threshold:
+            count += 1
+            delta = x - mean
+            mean += delta / count
+            m2 += delta * (x - mean)
+
+    return max_hgs, count, mean, m2
+
+def calculate_plateau_coefficient(grip_strength):
+    _, count, plateau_mean, m2 = _plateau_kernel(grip_strength)
+
+    if count == 0:
+        return None  # No plateau region found
+
+    # Sample standard deviation (ddof=1), matching pandas' .std()
+    plateau_std = np.sqrt(m2 / (count - 1)) if count > 1 else np.float64(np.nan)
+
+    coefficient_of_variation = (plateau_std * 100) / plateau_mean
+    return coefficient_of_variation
+
+def find_peak_grip_strength(time, grip_strength):
+    i = np.argmax(grip_strength)
+    return grip_strength[i], time[i]
+
+def find_time_for_percentages(time, grip_strength, percentages):
+    results = {}
+    max_hgs, peak_time = find_peak_grip_strength(time, grip_strength)
+
+    # Consider only the data points after the peak is reached
+    # Samples are stamped with a monotonic clock, so time never decreases and
+    # the post-peak samples are the slice starting at the first sample with
+    # time >= peak_time
+    start = np.searchsorted(time, peak_time, side='left')
+
+    # The running minimum after the peak never increases, so the first sample
+    # at or below every target can be found with a single binary search
+    post_peak_time = time[start:]
+    running_min = np.minimum.accumulate(grip_strength[start:])
+    targets = max_hgs * (np.asarray(percentages) / 100)
+    crossings = np.searchsorted(-running_min, -targets, side='left')
+
+    for percentage, i in zip(percentages, crossings):
+        if i < len(running_min):
+            results[percentage] = post_peak_time[i] - peak_time
+        else:
+            results[percentage] = None
+
+    return results
+
+# ----- Joint Stiffness Analysis -----
+@njit(cache=True, fastmath=True)
+def _joint_stiffness_kernel(time, force, window_time):
+    """
+    Walk the FSR samples once, accumulating the negative slopes after the peak,
+    the trapezoidal impulse and the steepest slope inside the RFD window.
+    The peak is tracked on the fly: whenever a new maximum appears, the
+    relaxation sums restart from it.
+    """
+    peak_force = force[0]
+    negative_sum = 0.0
+    negative_count = 0
+    impulse = 0.0
+    max_rfd = 0.0
+    rfd_count = 0
+
+    for i in range(1, len(time)):
+        dt = time[i] - time[i - 1]
+        impulse += 0.5 * (force[i] + force[i - 1]) * dt
+        if force[i] > peak_force:
+            peak_force = force[i]
+            negative_sum = 0.0
+            negative_count = 0
+        if dt == 0:
+            continue  # Samples sharing a timestamp have no defined slope
+
+        slope = (force[i] - force[i - 1]) / dt
+        if slope < 0:
+            negative_sum += slope
+            negative_count += 1
+        if time[i] <= window_time:
+            if rfd_count == 0 or slope > max_rfd:
+                max_rfd = slope
+            rfd_count += 1
+
+    return negative_sum, negative_count, impulse, max_rfd, rfd_count
+
+def calculate_joint_stiffness_metrics(time, force):
+    """
+    Calculate joint stiffness metrics: Force Relaxation Rate,
+    Force-Time Integral (Impulse), and Rate of Force Development (RFD).
+    Expects contiguous float64 arrays, as returned by read_data.
+    """
+    window_ms = 100
+    window_time = time[0] + window_ms / 1000.0
+
+    negative_sum, negative_count, impulse, max_rfd, rfd_count = _joint_stiffness_kernel(
+        time, force, window_time)
+
+    relaxation_rate = negative_sum / negative_count if negative_count > 0 else None
+    if rfd_count == 0:
+        max_rfd = None
+
+    return relaxation_rate, impulse, max_rfd
@@ -4,87 +4,95 @@ from tkinter.filedialog import asksaveasfilename
 import serial
 import threading
 import time
-import csv
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import matplotlib.animation as animation
+from analysis_core import RECORD, SENSOR_IDS
+from acquisition_core import LogWriter, SensorBuffer, downsample, plot_xlim, sample_time
 
 # ----- Serial Setup -----
 SERIAL_PORT = "COM3"      # Update as needed
 BAUD_RATE = 9600
-ser = serial.Serial(SERIAL_PORT, BAUD_RATE, timeout=1)
+ser = serial.Serial(SERIAL_PORT, BAUD_RATE, timeout=None)  # Reads block until data arrives
 time.sleep(2)  # Allow Arduino to initialize
 ser.reset_input_buffer()  # Clear any junk data
 
 print("Waiting for Arduino to be ready...")
 while True:
-    if ser.in_waiting > 0:
-        line = ser.readline().decode('utf-8', errors="ignore").strip()
-        if "READY" in line:
-            print("Arduino is ready!")
-            break
+    line = ser.read_until(b"\n").decode('utf-8', errors="ignore").strip()
+    if "READY" in line:
+        print("Arduino is ready!")
+        break
 
-# ----- Prompt User for CSV Filename -----
+# ----- Prompt User for Log Filename -----
 # Initialize a hidden Tkinter root for the file dialog.
 root = tk.Tk()
 root.withdraw()  # Hide the root window
 
-def get_csv_filename():
+def get_log_filename():
     # Prompt user to select a file name and location
     file_path = asksaveasfilename(
-        defaultextension=".csv",
-        filetypes=[("CSV files", "*.csv")],
-        title="Save CSV File As"
+        defaultextension=".bin",
+        filetypes=[("Sensor log files", "*.bin")],
+        title="Save Sensor Log As"
     )
     return file_path
 
-CSV_FILENAME = get_csv_filename()
-if not CSV_FILENAME:
+LOG_FILENAME = get_log_filename()
+if not LOG_FILENAME:
     print("No file selected. Exiting.")
     ser.close()
     exit()
 
-# ----- CSV Setup -----
-with open(CSV_FILENAME, mode="w", newline="") as f:
-    writer = csv.writer(f)
-    writer.writerow(["Timestamp", "Value", "Sensor"])
+# ----- Sensor Log Setup -----
+# Keep the file open for the whole session, written from its own thread.
+log_writer = LogWriter(LOG_FILENAME)
 
 # ----- Data Storage for Plotting -----
-# We'll keep separate lists for FSR and Weight data.
+# We'll keep a separate buffer for FSR and Weight data.
 sensor_data = {
-    "FSR": [],
-    "Weight": []
+    "FSR": SensorBuffer(),
+    "Weight": SensorBuffer()
 }
 
 # Store the time when the first data point arrives, so we can plot relative time (0s start).
 start_time = None
 
 # ----- Serial Reading Thread -----
+reader_stop = threading.Event()  # Set at shutdown to end the reading loop
+
 def serial_reader():
     global start_time
-    while True:
+    buf = b""
+    while not reader_stop.is_set():
+        # Block in the driver until a full line arrives, then take whatever else
+        # is already waiting so a burst is handled in one pass. Any partial
+        # line is kept for the next iteration.
+        buf += ser.read_until(b"\n")
         if ser.in_waiting > 0:
-            line = ser.readline().decode('utf-8', errors="ignore").strip()
-            if "," in line:
-                try:
-                    value_str, sensor_type = line.split(",")
-                    value = float(value_str)
-                    now = time.time()
-                    
-                    if start_time is None:
-                        start_time = now
-
-                    ts_str = time.strftime("%Y-%m-%d %H:%M:%S")
-                    with open(CSV_FILENAME, mode="a", newline="") as f:
-                        writer = csv.writer(f)
-                        writer.writerow([ts_str, value, sensor_type])
-
-                    if sensor_type in sensor_data:
-                        sensor_data[sensor_type].append((now - start_time, value))
-
-                except ValueError:
-                    print("Invalid data received:", line)
-        time.sleep(0.1)
+            buf += ser.read(ser.in_waiting)
+        lines = buf.split(b"\n")
+        buf = lines.pop()
+        for raw in lines:
+            line = raw.decode('utf-8', errors="ignore").strip()
+            if "," not in line:
+                continue
+            try:
+                value_str, sensor_type = line.split(",")
+                value = float(value_str)
+                now = sample_time()
+                
+                if start_time is None:
+                    start_time = now
+
+                if sensor_type in SENSOR_IDS:
+                    log_writer.write(RECORD.pack(now, value, SENSOR_IDS[sensor_type]))
+
+                if sensor_type in sensor_data:
+                    sensor_data[sensor_type].append(now - start_time, value)
+
+            except ValueError:
+                print("Invalid data received:", line)
 
 serial_thread = threading.Thread(target=serial_reader, daemon=True)
 serial_thread.start()
@@ -115,16 +123,21 @@ class App(tk.Tk):
         
         self.ax_fsr.set_title("FSR Force-Time")
         self.ax_fsr.set_ylabel("FSR Reading")
-        
+        self.ax_fsr.set_xlabel("Time (s)")
+
         self.ax_weight.set_title("Load Cell Weight-Time")
-        self.ax_weight.set_ylabel("Weight (units?)")
+        self.ax_weight.set_ylabel("Weight")
         self.ax_weight.set_xlabel("Time (s)")
 
+        # The line artists are created once; update_plot only swaps their data
+        self.line_fsr, = self.ax_fsr.plot([], [], marker=".", linestyle="-", markersize=3, linewidth=1)
+        self.line_weight, = self.ax_weight.plot([], [], marker=".", linestyle="-", markersize=3, linewidth=1)
+
         self.canvas = FigureCanvasTkAgg(self.fig, master=self)
         self.canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
         
         # Start animation to update plot every 1 second
-        self.ani = animation.FuncAnimation(self.fig, self.update_plot, interval=1000)
+        self.ani = animation.FuncAnimation(self.fig, self.update_plot, interval=1000, blit=True)
         
     def send_command(self, cmd):
         try:
@@ -137,34 +150,45 @@ class App(tk.Tk):
             print("Error sending command:", e)
     
     def update_plot(self, frame):
-        # Clear each subplot
-        self.ax_fsr.clear()
-        self.ax_weight.clear()
-        
-        # Redraw titles, labels
-        self.ax_fsr.set_title("FSR Force-Time")
-        self.ax_fsr.set_ylabel("FSR Reading")
-        self.ax_fsr.set_xlabel("Time (s)")
-        
-        self.ax_weight.set_title("Load Cell Weight-Time")
-        self.ax_weight.set_ylabel("Weight")
-        self.ax_weight.set_xlabel("Time (s)")
-        
-        # Plot FSR data if available
-        if sensor_data["FSR"]:
-            times, forces = zip(*sensor_data["FSR"])
-            self.ax_fsr.plot(times, forces, marker=".", linestyle="-", markersize=3, linewidth=1)
-        
-        # Plot Weight data if available
-        if sensor_data["Weight"]:
-            times, weights = zip(*sensor_data["Weight"])
-            self.ax_weight.plot(times, weights, marker=".", linestyle="-", markersize=3, linewidth=1)
-        
-        self.canvas.draw()
+        old_limits = (self.ax_fsr.get_xlim(), self.ax_fsr.get_ylim(), self.ax_weight.get_ylim())
+        for name, line, ax in (("FSR", self.line_fsr, self.ax_fsr),
+                               ("Weight", self.line_weight, self.ax_weight)):
+            samples = sensor_data[name].read()
+            if samples is None:
+                continue  # Nothing new for this sensor since the last frame
+            times, values = downsample(*samples)
+            line.set_data(times, values)
+            # Only autoscale the values; the shared time axis is set below
+            ax.relim()
+            ax.autoscale_view(scalex=False)
+
+        # The axes share one time axis, so size it from both lines, including a
+        # sensor that sent nothing this frame, and grow it in coarse steps
+        plotted = [line.get_xdata() for line in (self.line_fsr, self.line_weight)]
+        plotted = [times for times in plotted if len(times)]
+        if plotted:
+            first = min(times[0] for times in plotted)
+            last = max(times[-1] for times in plotted)
+            self.ax_fsr.set_xlim(plot_xlim(old_limits[0], first, last))
+        limits_changed = (self.ax_fsr.get_xlim(), self.ax_fsr.get_ylim(),
+                          self.ax_weight.get_ylim()) != old_limits
+
+        # Blitting only repaints the lines, so redraw the full figure (ticks and
+        # labels) when the axis limits have moved. The animation then re-caches
+        # the new background before blitting the lines on top.
+        if limits_changed:
+            self.canvas.draw()
+
+        return self.line_fsr, self.line_weight
 
 # Create and start the GUI application.
 app = App()
 app.mainloop()
 
-# Close the serial port when the GUI closes.
-ser.close()
\ No newline at end of file
+# Stop the serial reader before closing the sensor log, so no record is
+# queued behind the writer's sentinel, then close the port and the log.
+reader_stop.set()
+ser.cancel_read()  # Wake the reader from its blocking read
+serial_thread.join(timeout=1.0)
+ser.close()
+log_writer.close()